@@ -5,16 +5,192 @@ This module is responsible for loading and parsing the application's
 config file (config.yaml).
 """
 
-import yaml
+import os
+import copy
+import json
+import pickle
+import struct
+import functools
+import warnings
 from pathlib import Path
+from typing import Dict, Tuple, Any, Optional
+
+@functools.lru_cache(maxsize = None)
+def _get_yaml():
+    """
+    Imports PyYAML on first use and returns (yaml, SafeLoader, SafeDumper).
+
+    Importing yaml is one of the most expensive parts of starting the CLI, and
+    it is only needed when config.yaml has to be parsed or written. A run served
+    from the compiled cache never imports it at all.
+    """
+    import yaml
+
+    # Prefer the LibYAML C bindings, they parse and emit roughly an order of
+    # magnitude faster than the pure-Python implementation.
+    try:
+        from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    except ImportError:
+        from yaml import SafeLoader, SafeDumper
+        warnings.warn(
+            "PyYAML was built without LibYAML support, falling back to the slower "
+            "pure-Python parser. Install 'libyaml' and reinstall PyYAML to speed up config loading.",
+            RuntimeWarning
+        )
+    return yaml, SafeLoader, SafeDumper
+
+# Parsed configs keyed by file path, stored alongside the (st_mtime_ns, st_size)
+# they were parsed from so an edited file is picked up on the next load.
+_CACHE: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
+
+# Resolved once per process. Expanding '~' otherwise goes back to the
+# environment (or the pwd database) every single time.
+_HOME = os.path.expanduser("~")
+
+@functools.lru_cache(maxsize = None)
+def expand_path(path_str: str) -> Path:
+    """
+    Converts a path from the config into a Path, expanding a leading '~'.
+
+    Equivalent to Path(path_str).expanduser(), but reuses the home directory
+    resolved at import time. '~user' forms still go through expanduser.
+
+    Results are cached per string (Path objects are immutable), so the
+    templates_dir and other config paths are only built once per process.
+    """
+    if not path_str.startswith("~"):
+        return Path(path_str)
+
+    if len(path_str) == 1 or path_str[1] in ("/", os.sep):
+        return Path(_HOME + path_str[1:])
+
+    return Path(path_str).expanduser()
+
+def _get_config_path() -> Path:
+    """
+    Returns the location of the config.yaml file shipped inside the 'tiedye' package.
+    """
+    return Path(__file__).parent / "config.yaml"
+
+# --- Compiled Config Cache ---
+# The parsed config is also pickled next to config.yaml, so later CLI runs can
+# skip YAML parsing entirely. The file starts with the (st_mtime_ns, st_size)
+# of the config.yaml it was built from and is ignored once those stop matching.
+_PICKLE_HEADER = struct.Struct('<qq')
+
+def _get_pickle_path(config_path: Path) -> Path:
+    """
+    Returns the location of the compiled cache for the given config file.
+    """
+    return config_path.with_suffix('.yaml.pkl')
+
+def _read_pickle_cache(
+        pickle_path: Path,
+        stamp: Tuple[int, int]
+) -> Optional[Dict[str, Any]]:
+    """
+    Returns the config stored in the compiled cache, or None if it is missing or stale.
+    """
+    try:
+        with open(pickle_path, 'rb') as f:
+            data = f.read()
+        if _PICKLE_HEADER.unpack_from(data) != stamp:
+            return None
+        return pickle.loads(data[_PICKLE_HEADER.size:])
+    except Exception:
+        # a missing, truncated or otherwise unreadable cache just means we parse the YAML.
+        return None
+
+def _write_pickle_cache(
+        pickle_path: Path,
+        stamp: Tuple[int, int],
+        config: Dict[str, Any]
+):
+    """
+    Atomically writes the compiled cache. Failures (e.g. a read-only install) are ignored.
+    """
+    tmp_path = pickle_path.with_name(f"{pickle_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(_PICKLE_HEADER.pack(*stamp) + pickle.dumps(config, protocol = 5))
+        os.replace(tmp_path, pickle_path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+def invalidate_config_cache():
+    """
+    Drops the cached config so the next load_config() re-reads it from disk.
+
+    Call this after writing to config.yaml, since a rewrite within the same
+    mtime tick and with the same size would otherwise go unnoticed.
+    """
+    config_path = _get_config_path()
+    _CACHE.pop(config_path, None)
+    try:
+        _get_pickle_path(config_path).unlink()
+    except OSError:
+        pass
+
+# --- Path Shortcuts ---
+# Shortcuts saved with `tiedye path save` live in their own small JSON file
+# instead of config.yaml, so saving one never has to re-serialize the whole
+# config. Once the file exists it replaces the 'paths' section of config.yaml.
+def _get_paths_file() -> Path:
+    """
+    Returns the location of the saved path shortcuts file.
+    """
+    return expand_path("~/.tiedye") / "paths.json"
+
+def _read_saved_paths() -> Optional[Dict[str, str]]:
+    """
+    Returns the saved path shortcuts, or None if none have been saved yet.
+
+    An unreadable or malformed file (e.g. hand-edited or truncated) also returns
+    None, with a warning, so config.yaml's own 'paths' are used instead of every
+    command failing on it.
+    """
+    paths_file = _get_paths_file()
+    try:
+        with open(paths_file, 'r') as f:
+            paths = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        warnings.warn(f"Ignoring unreadable path shortcuts file '{paths_file}': {e}", RuntimeWarning)
+        return None
+
+    if not isinstance(paths, dict):
+        warnings.warn(f"Ignoring path shortcuts file '{paths_file}': expected a JSON object.", RuntimeWarning)
+        return None
+
+    return paths
+
+def save_paths(paths: Dict[str, str]):
+    """
+    Atomically replaces the saved path shortcuts.
+
+    The file is written to a temporary file in the same directory first and then
+    moved into place, so a crash can never leave a half-written file behind.
+    """
+    paths_file = _get_paths_file()
+    paths_file.parent.mkdir(parents = True, exist_ok = True)
+
+    tmp_path = paths_file.with_name(f"{paths_file.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(paths, f, indent = 2)
+    os.replace(tmp_path, paths_file)
 
 def load_config():
 
     """
     Finds, loads, and parses the config.yaml file.
 
-    This function locates the configuration file relative to its own location, 
+    This function locates the configuration file relative to its own location,
     ensuring that it works regardless of where the script is executed from.
+    Saved path shortcuts (see save_paths) replace the file's 'paths' section.
 
     returns:
         dict: a dictionary containing the parsed config
@@ -23,15 +199,68 @@ def load_config():
         FileNotFoundError: if the config.yaml file cannot be found
     """
 
-    config_path = Path(__file__).parent / "config.yaml"
+    config_path = _get_config_path()
 
-    if not config_path.exists():
+    try:
+        st = config_path.stat()
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Configuration file not found at: {config_path}. "
             "Please ensure 'config.yaml' exists in the 'tiedye' directory."
         )
 
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    cached = _CACHE.get(config_path)
+    if cached and cached[:2] == stamp:
+        config = cached[2]
+    else:
+        pickle_path = _get_pickle_path(config_path)
+        config = _read_pickle_cache(pickle_path, stamp)
+
+        if config is None:
+            yaml, SafeLoader, _ = _get_yaml()
+            # (read as raw bytes: LibYAML detects and decodes the UTF-8 itself,
+            # so the text layer doesn't have to decode it first)
+            with open(config_path, 'rb') as f:
+                config = yaml.load(f, Loader = SafeLoader)
+            _write_pickle_cache(pickle_path, stamp, config)
+
+        _CACHE[config_path] = (*stamp, config)
+
+    # callers are free to mutate the returned dict, so always hand out a copy.
+    config = copy.deepcopy(config)
+    saved_paths = _read_saved_paths()
+    if saved_paths is not None:
+        config['paths'] = saved_paths
+
+    return config
+
+def save_config(config: Dict[str, Any]):
+    """
+    Atomically writes 'config' back to config.yaml.
+
+    The YAML is emitted straight to bytes in a temporary file next to
+    config.yaml, which is then moved over it with os.replace. A crash mid-write
+    therefore never leaves a truncated config behind.
+
+    Saved path shortcuts live in paths.json (see save_paths), so config.yaml's
+    own 'paths' section is written back unchanged rather than overwritten by them.
+    """
+    config_path = _get_config_path()
+
+    if _read_saved_paths() is not None:
+        cached = _CACHE.get(config_path)
+        config = dict(config)
+        if cached and 'paths' in cached[2]:
+            config['paths'] = cached[2]['paths']
+        else:
+            config.pop('paths', None)
+
+    yaml, _, SafeDumper = _get_yaml()
+    tmp_path = config_path.with_suffix('.yaml.tmp')
+    with open(tmp_path, 'wb') as f:
+        yaml.dump(config, f, Dumper = SafeDumper, encoding = 'utf-8', indent = 2, sort_keys = False)
+    os.replace(tmp_path, config_path)
 
-    return config
\ No newline at end of file
+    invalidate_config_cache()
\ No newline at end of file
@@ -0,0 +1,299 @@
+"""
+tiedye/fastcopy.py
+
+This module contains the file and directory copy helpers shared by the
+scaffolder and the sorter.
+
+Each file is copied with the cheapest mechanism the platform offers, in order:
+a copy-on-write clone, an in-kernel os.copy_file_range, os.sendfile (Linux)
+or CopyFileExW (Windows), and finally shutil.copyfile. On Windows whole trees
+are handed to robocopy.
+"""
+
+import os
+import sys
+import errno
+import functools
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Union, List, Tuple
+
+# --- Copy-on-write Support ---
+# On Linux the FICLONE ioctl asks the filesystem (Btrfs, XFS, ...) to share the
+# source file's data blocks instead of copying them. macOS exposes the same idea
+# through clonefile() on APFS.
+_FICLONE = None
+_clonefile = None
+_CopyFileExW = None
+
+if sys.platform.startswith("linux"):
+    import fcntl
+    _FICLONE = 0x40049409 # (_IOW(0x94, 9, int) from <linux/fs.h>)
+elif sys.platform == "darwin":
+    import ctypes
+    try:
+        _libsystem = ctypes.CDLL("/usr/lib/libSystem.dylib", use_errno = True)
+        _clonefile = _libsystem.clonefile
+        _clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+        _clonefile.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _clonefile = None
+elif sys.platform == "win32":
+    # shutil.copyfile on Windows pushes every byte through a Python buffer;
+    # CopyFileExW lets the OS copy the file (and use server-side copies on SMB).
+    # A private kernel32 handle is loaded so setting argtypes/restype below
+    # doesn't change the function pointer shared through ctypes.windll.
+    import ctypes
+    from ctypes import wintypes
+    try:
+        _kernel32 = ctypes.WinDLL("kernel32", use_last_error = True)
+        _CopyFileExW = _kernel32.CopyFileExW
+        _CopyFileExW.argtypes = [
+            wintypes.LPCWSTR, wintypes.LPCWSTR,
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, wintypes.DWORD
+        ]
+        _CopyFileExW.restype = wintypes.BOOL
+    except (OSError, AttributeError):
+        _CopyFileExW = None
+
+# sendfile() only accepts a regular file as its output on Linux.
+_HAS_SENDFILE = sys.platform.startswith("linux") and hasattr(os, "sendfile")
+
+_CHUNK_SIZE = 1 << 30
+
+# copies are I/O bound, so allow several per core to keep the device queue full.
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+def _rewind(
+        src_fd: int,
+        dst_fd: int
+):
+    """
+    Resets both descriptors so a fallback copy starts from a clean, empty destination.
+    """
+    os.lseek(src_fd, 0, os.SEEK_SET)
+    os.lseek(dst_fd, 0, os.SEEK_SET)
+    os.ftruncate(dst_fd, 0)
+
+def _kernel_copy(
+        src: str,
+        dst: str
+) -> bool:
+    """
+    Tries to copy a file's data without moving its bytes through Python.
+
+    Returns False if no kernel-side mechanism worked, so the caller can fall back.
+    """
+    if _clonefile is not None:
+        # clonefile() creates the destination itself, so it must run before we open it.
+        if _clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+            return True
+
+    if _CopyFileExW is not None:
+        # (no progress callback, and no flags so an existing destination is overwritten)
+        return bool(_CopyFileExW(os.fspath(src), os.fspath(dst), None, None, None, 0))
+
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+
+        if _FICLONE is not None:
+            try:
+                fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+                return True
+            except OSError:
+                pass # (not a reflink-capable filesystem, or crossing devices)
+
+        if hasattr(os, "copy_file_range"):
+            try:
+                copied = os.copy_file_range(src_fd, dst_fd, _CHUNK_SIZE)
+                # Some kernels (5.3 - 5.18) return 0 straight away for cross-filesystem
+                # copies they can't do, which would leave an empty destination. A
+                # first result of 0 only means EOF if the source really is empty.
+                if copied or not os.fstat(src_fd).st_size:
+                    while copied:
+                        copied = os.copy_file_range(src_fd, dst_fd, _CHUNK_SIZE)
+                    return True
+                _rewind(src_fd, dst_fd)
+            except OSError:
+                _rewind(src_fd, dst_fd)
+
+        if _HAS_SENDFILE:
+            try:
+                offset = 0
+                while True:
+                    sent = os.sendfile(dst_fd, src_fd, offset, _CHUNK_SIZE)
+                    if not sent:
+                        return True
+                    offset += sent
+            except OSError:
+                _rewind(src_fd, dst_fd)
+
+    return False
+
+def copy_file(
+        src: Union[str, Path],
+        dst: Union[str, Path]
+):
+    """
+    Copies a single file's data and metadata, like shutil.copy2.
+
+    'dst' is overwritten if it already exists.
+    """
+    if not _kernel_copy(src, dst):
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+@functools.lru_cache(maxsize = None)
+def _find_robocopy():
+    """
+    Returns robocopy's location on Windows (None elsewhere), searching PATH only once per process.
+    """
+    return shutil.which("robocopy") if sys.platform == "win32" else None
+
+def _robocopy(
+        robocopy: str,
+        src: Union[str, Path],
+        dst: Union[str, Path]
+):
+    """
+    Copies the directory 'src' to 'dst' with robocopy's multi-threaded copier.
+
+    Per-file copies through CopyFileEx are very slow on Windows for large trees;
+    robocopy keeps many of them in flight at once.
+    """
+    # robocopy happily merges into an existing directory, so enforce the same
+    # "must not exist yet" contract as the portable implementation.
+    if os.path.exists(dst):
+        raise FileExistsError(f"Destination '{dst}' already exists.")
+
+    result = subprocess.run(
+        [
+            robocopy, str(src), str(dst),
+            "/E", "/MT:64", "/COPY:DAT", "/DCOPY:DAT", "/R:0", "/W:0",
+            "/NFL", "/NDL", "/NJH", "/NJS", "/NP"
+        ],
+        capture_output = True,
+        text = True
+    )
+    # exit codes 0-7 are success bitmasks (files copied, extras found, ...); 8 and up are failures.
+    if result.returncode >= 8:
+        raise shutil.Error([(str(src), str(dst), f"robocopy failed with exit code {result.returncode}: {result.stdout.strip()}")])
+
+def _create_tree(
+        src: Union[str, Path],
+        dst: Union[str, Path],
+        directories: List[Tuple[str, str]],
+        files: List[Tuple[str, str]],
+        errors: List[Tuple[str, str, str]]
+):
+    """
+    Recreates the directory structure of 'src' under 'dst' and records the
+    (source, destination) pairs of every directory and file it contains.
+
+    Anything that is neither a directory nor a regular file (named pipes,
+    sockets, devices, broken symlinks) is recorded in 'errors' instead, since
+    opening it to copy could block forever. shutil.copytree reports them the same way.
+    """
+    os.mkdir(dst)
+    directories.append((src, dst))
+
+    with os.scandir(src) as it:
+        entries = list(it)
+
+    for entry in entries:
+        target = os.path.join(dst, entry.name)
+        if entry.is_dir():
+            _create_tree(entry.path, target, directories, files, errors)
+        elif entry.is_file():
+            files.append((entry.path, target))
+        else:
+            errors.append((entry.path, target, f"`{entry.path}` is not a regular file"))
+
+def _copy_files(files: List[Tuple[str, str]]) -> List[Tuple[str, str, str]]:
+    """
+    Copies every (source, destination) pair with copy_file, concurrently when
+    there is more than one, and returns a (src, dst, reason) tuple per failure.
+    """
+    errors = []
+
+    if len(files) < 2:
+        # a single file isn't worth spinning up a thread pool for.
+        for src, dst in files:
+            try:
+                copy_file(src, dst)
+            except OSError as e:
+                errors.append((src, dst, str(e)))
+        return errors
+
+    with ThreadPoolExecutor(max_workers = min(_MAX_WORKERS, len(files))) as pool:
+        futures = {pool.submit(copy_file, src, dst): (src, dst) for src, dst in files}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except OSError as e:
+                errors.append((*futures[future], str(e)))
+
+    return errors
+
+def copy_tree(
+        src: Union[str, Path],
+        dst: Union[str, Path]
+):
+    """
+    Recursively copies the directory 'src' to 'dst', which must not exist yet.
+
+    Behaves like shutil.copytree. On Windows the copy is delegated to robocopy
+    when it is available. Everywhere else the tree is walked with os.scandir,
+    so every entry's type comes straight from the directory listing.
+    Directories are created up front, then the files are copied with copy_file
+    on a thread pool so several copies are in flight at once (the GIL is
+    released during the copy syscalls).
+
+    raises:
+        shutil.Error: listing every (src, dst, reason) that failed to copy,
+        the same way shutil.copytree reports errors
+    """
+    robocopy = _find_robocopy()
+    if robocopy:
+        _robocopy(robocopy, src, dst)
+        return
+
+    directories = []
+    files = []
+    errors = []
+    _create_tree(src, dst, directories, files, errors)
+
+    errors.extend(_copy_files(files))
+
+    # copied last and deepest first, since adding entries changes a directory's mtime.
+    for dir_src, dir_dst in reversed(directories):
+        try:
+            shutil.copystat(dir_src, dir_dst)
+        except OSError as e:
+            errors.append((dir_src, dir_dst, str(e)))
+
+    if errors:
+        raise shutil.Error(errors)
+
+def move_tree(
+        src: Union[str, Path],
+        dst: Union[str, Path]
+):
+    """
+    Moves the directory 'src' to 'dst', which must not exist yet.
+
+    Within one filesystem this is a single rename, no matter how many files the
+    tree holds. Across filesystems (EXDEV) it falls back to copy_tree followed
+    by removing 'src'.
+    """
+    try:
+        os.rename(src, dst)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+    copy_tree(src, dst)
+    shutil.rmtree(src)
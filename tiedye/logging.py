@@ -5,11 +5,10 @@ This module handles the analytics logging for the application.
 It uses SQLite to store events in a database.
 """
 
-import sqlite3
-import json
+import threading
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Tuple
 
 def _get_db_path() -> Path:
     """
@@ -20,51 +19,122 @@ def _get_db_path() -> Path:
     db_dir.mkdir(parents = True, exist_ok = True)
     return db_dir / "analytics.db"
 
+# A single connection is shared by every log call in the process. Events are
+# inserted without an immediate commit and written out in one transaction by
+# flush_events(), which main.py registers to run at exit.
+#
+# Nothing is opened at import time: commands that never log an event (like
+# `tiedye --help`) don't pay for the mkdir, the SQLite open or the sqlite3 import.
+_connection = None
+_lock = threading.Lock()
+
+def _get_connection():
+    """
+    Returns the shared database connection. On first use this opens and tunes
+    the connection and creates the 'events' table if it does not already exist.
+
+    Must be called with _lock held.
+    """
+    global _connection
+    if _connection is None:
+        import sqlite3
+
+        con = sqlite3.connect(_get_db_path(), check_same_thread = False)
+        # WAL + synchronous=NORMAL avoids an fsync on every commit while still
+        # keeping the database consistent if the process dies.
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.execute("PRAGMA temp_store=MEMORY")
+        con.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY,
+                    timestamp TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    details TEXT
+                    )
+                    """
+                    )
+        con.commit()
+        _connection = con
+    return _connection
+
 def init_db():
     """
     Initializes the database and creates the 'events' table if it does not already exist.
-    This is safe to run every time.
-    """
-    db_path = _get_db_path()
-    # opens a connection to the db file
-    con = sqlite3.connect(db_path)
-    # a cursor is an object used to execute SQL commands
-    cur = con.cursor()
-
-    cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS events (
-                id INTEGER PRIMARY KEY,
-                timestamp TEXT NOT NULL,
-                event_type TEXT NOT NULL,
-                details TEXT
-                )
-                """
-                )
-    
-    con.commit()
-    con.close()
+    This is safe to run every time, but is not required: logging initializes on first use.
+    """
+    with _lock:
+        _get_connection()
+
+_dumps = None
+
+def _get_dumps():
+    """
+    Returns the JSON serializer used for event details, resolved on first use.
+
+    orjson (a C implementation) is several times faster than the standard
+    library's json module and is used when installed.
+    """
+    global _dumps
+    if _dumps is None:
+        try:
+            import orjson
+            _dumps = lambda obj: orjson.dumps(obj).decode()
+        except ImportError:
+            import json
+            _dumps = json.dumps
+    return _dumps
+
+_INSERT_SQL = "INSERT INTO events (timestamp, event_type, details) VALUES (?, ?, ?)"
+
+def event_timestamp() -> str:
+    """
+    Returns the current time in the format events are stored with (UTC, ISO 8601).
+    """
+    return datetime.now(timezone.utc).isoformat()
 
 def log_event(event_type: str, details: Dict[str, Any]):
     """
     Logs a new event to the database.
 
+    The event is written as part of the pending transaction and committed by flush_events().
+
     Args:
         event_type: A string identifying the type of event (e.g., 'file_sorted').
         details: A dictionary containing event-specific metadata.
     """
-    db_path = _get_db_path()
-    con = sqlite3.connect(db_path)
-    cur = con.cursor()
+    timestamp = event_timestamp()
+    details_json = _get_dumps()(details)
 
-    timestamp = datetime.now(timezone.utc).isoformat()
-    details_json = json.dumps(details)
+    with _lock:
+        _get_connection().execute(_INSERT_SQL, (timestamp, event_type, details_json))
 
-    sql = "INSERT INTO events (timestamp, event_type, details) VALUES (?, ?, ?)"
+def log_events_bulk(events: Iterable[Tuple[str, str, Dict[str, Any]]]):
+    """
+    Logs many events at once using a single executemany inside one transaction.
 
-    cur.execute(sql, (timestamp, event_type, details_json))
+    Args:
+        events: An iterable of (timestamp, event_type, details) tuples. Each
+            timestamp should come from event_timestamp() at the moment the event
+            happened, so batched events keep their own time.
+    """
+    dumps = _get_dumps()
+    rows = [(timestamp, event_type, dumps(details)) for timestamp, event_type, details in events]
+
+    if not rows:
+        return
 
-    con.commit()
-    con.close()
+    with _lock:
+        con = _get_connection()
+        # the connection's context manager commits on success and rolls back on error.
+        with con:
+            con.executemany(_INSERT_SQL, rows)
 
-init_db()
+def flush_events():
+    """
+    Commits any events that were logged but not yet written to disk.
+    """
+    with _lock:
+        if _connection is not None:
+            _connection.commit()
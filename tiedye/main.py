@@ -5,52 +5,75 @@ This module is the main entry point for the TieDye CLI app.
 It uses Typer to create a clean command-line interface.
 """
 
+import atexit
 import typer
 import os
-from pathlib import Path
 
 from .config_loader import load_config
+from .logging import flush_events
 
-from .plugins.core.sorter import sort_files
-from .plugins.core.scaffolder import save_template, create_project, list_templates, favorite_template, unfavorite_template
-from .plugins.core.path import save_path, remove_path, list_paths, get_path
+_RED = typer.colors.RED
 
-from .plugins.git_workflows.git_plugin import start_feature, sync_work, finish_feature
+# Plugin modules are imported inside the command that uses them, so each
+# invocation only pays the import cost of the plugin it actually runs.
 
 app = typer.Typer(
     help = "TieDye CLI: A tool for file sorting, project scaffolding, and workflow automation.",
     no_args_is_help = True
 )
 
+# events are committed in one go when the CLI exits rather than once per event.
+atexit.register(flush_events)
+
+@app.callback()
+def main(ctx: typer.Context):
+    """
+    Loads config.yaml once per invocation and shares it with every command through ctx.obj.
+    """
+    # the git commands never read the config, so don't make them pay for (or fail on) loading it.
+    if ctx.invoked_subcommand == "git":
+        return
+
+    # (a missing, unreadable or malformed config.yaml gets a one-line error, not a traceback)
+    try:
+        ctx.obj = load_config()
+    except Exception as e:
+        typer.secho(f"ERROR: {e}", fg = _RED, err = True)
+        raise typer.Exit(code = 1)
+
 # --- Sort Command ---
 @app.command("sort")
 def sort(
+    ctx: typer.Context,
     source: str = typer.Argument(
         ..., # makes the argument required
         help="The path to the directory we want to sort."
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose", "-v",
+        help = "Print a line for every file moved, renamed or skipped."
     )
 ):
     """
     Sorts files in a directory based on the rules in config.yaml
     """
 
+    from .plugins.core.sorter import sort_files
+
     if source == ".":
         source = os.getcwd()
 
     print("Initializing sorter...")
     try:
-        # --- 1. Load Configuration ---
-        config = load_config()
-
-        # --- 2. Call the Core Logic ---
-        sort_files(config, source)
+        sort_files(ctx.obj, source, verbose)
 
         print("\nSorting Complete!")
 
     except FileNotFoundError as e:
-        typer.secho(f"ERROR: {e}", fg = typer.colors.RED)
+        typer.secho(f"ERROR: {e}", fg = _RED)
     except Exception as e:
-        typer.secho(f"An unexpected error occured: {e}", fg = typer.colors.RED)
+        typer.secho(f"An unexpected error occured: {e}", fg = _RED)
 
 # --- Scaffolder Command Group ---
 scaffold_app = typer.Typer(
@@ -61,6 +84,7 @@ app.add_typer(scaffold_app, name = "scaffold")
 
 @scaffold_app.command("save")
 def scaffold_save(
+    ctx: typer.Context,
     source: str = typer.Argument(
         ...,
         help = "The path to the source directory to save as a template."
@@ -68,23 +92,29 @@ def scaffold_save(
     name: str = typer.Argument(
         ...,
         help = "The name to save the template as."
+    ),
+    move: bool = typer.Option(
+        False,
+        "--move",
+        help = "Move the source directory into the templates folder instead of copying it."
     )
 ):
     """
     Saves a directory structure as a reusable template.
     """
+    from .plugins.core.scaffolder import save_template
 
     if source == ".":
         source = os.getcwd()
 
     try:
-        config = load_config()
-        save_template(config, name, source)
+        save_template(ctx.obj, name, source, move)
     except Exception as e:
-        typer.secho(f"An unexpected error occurred: {e}", fg = typer.colors.RED)
+        typer.secho(f"An unexpected error occurred: {e}", fg = _RED)
 
 @scaffold_app.command("new")
 def scaffold_new(
+    ctx: typer.Context,
     template: str = typer.Argument(
         ...,
         help = "The name of the template to use."
@@ -92,30 +122,38 @@ def scaffold_new(
     name: str = typer.Argument(
         ...,
         help = "The name of the new project directory to create."
+    ),
+    move: bool = typer.Option(
+        False,
+        "--move",
+        help = "Consume the template: move it to the new project instead of copying it."
     )
 ):
     """
     Creates a new project from a saved template.
     """
+    from .plugins.core.scaffolder import create_project
+
     try:
-        config = load_config()
-        create_project(config,  template, name)
+        create_project(ctx.obj, template, name, move)
     except Exception as e:
-        typer.secho(f"An unexpected error occurred: {e}", fg = typer.colors.RED)
+        typer.secho(f"An unexpected error occurred: {e}", fg = _RED)
 
 @scaffold_app.command("list")
-def scaffold_list():
+def scaffold_list(ctx: typer.Context):
     """
     Lists all avaliable project templates.
     """
+    from .plugins.core.scaffolder import list_templates
+
     try:
-        config = load_config()
-        list_templates(config)
+        list_templates(ctx.obj)
     except Exception as e:
-        typer.secho(f"An unexpected error occurred: {e}", fg = typer.colors.RED)
+        typer.secho(f"An unexpected error occurred: {e}", fg = _RED)
 
 @scaffold_app.command("favorite")
 def scaffold_favorite(
+    ctx: typer.Context,
     name: str = typer.Argument(
         ...,
         help = "The name of the template to mark as favorite."
@@ -124,10 +162,13 @@ def scaffold_favorite(
     """
     Marks a template as a favorite.
     """
-    favorite_template(name)
+    from .plugins.core.scaffolder import favorite_template
+
+    favorite_template(ctx.obj, name)
 
 @scaffold_app.command("unfavorite")
 def scaffold_unfavorite(
+    ctx: typer.Context,
     name: str = typer.Argument(
         ...,
         help = "The name of the template to unmark as favorite."
@@ -136,7 +177,9 @@ def scaffold_unfavorite(
     """
     Removes a template from the favorites list.
     """
-    unfavorite_template(name)
+    from .plugins.core.scaffolder import unfavorite_template
+
+    unfavorite_template(ctx.obj, name)
 
 path_app = typer.Typer(
     help = "Save and use shortcuts for frequently used directories."
@@ -145,6 +188,7 @@ app.add_typer(path_app, name = "path")
 
 @path_app.command("save")
 def path_save(
+    ctx: typer.Context,
     name: str = typer.Argument(
         ...,
         help = "The name of the shortcut."
@@ -157,12 +201,15 @@ def path_save(
     """
     Saves a directory as a named shortcut.
     """
+    from .plugins.core.path import save_path
+
     if path == ".":
         path = os.getcwd()
-    save_path(name, path)
+    save_path(ctx.obj, name, path)
 
 @path_app.command("remove")
 def path_remove(
+    ctx: typer.Context,
     name: str = typer.Argument(
         ...,
         help = "The name of the shortcut to remove."
@@ -171,18 +218,22 @@ def path_remove(
     """
     Removes a saved shortcut.
     """
-    remove_path(name)
+    from .plugins.core.path import remove_path
+
+    remove_path(ctx.obj, name)
 
 @path_app.command("list")
-def path_list():
+def path_list(ctx: typer.Context):
     """
     Lists all saved shortcuts.
     """
-    config = load_config()
-    list_paths(config)
+    from .plugins.core.path import list_paths
+
+    list_paths(ctx.obj)
 
 @path_app.command("get")
 def path_get(
+    ctx: typer.Context,
     name: str = typer.Argument(
         ...,
         help = "The name of the shortcut to retrieve."
@@ -191,8 +242,9 @@ def path_get(
     """
     Retrieves and prints a path for shell use. (internal use)
     """
-    config = load_config()
-    get_path(config, name)
+    from .plugins.core.path import get_path
+
+    get_path(ctx.obj, name)
 
 git_app = typer.Typer(
     help = "Commands to automate common Git workflows."
@@ -209,6 +261,8 @@ def git_start_feature(
     """
     Cheks out main, pulls latest, and creates a new feature branch.
     """
+    from .plugins.git_workflows.git_plugin import start_feature
+
     start_feature(name)
 
 @git_app.command("sync")
@@ -221,6 +275,8 @@ def git_sync(
     """
     Adds all changes, commits them, and pushes to the remote branch.
     """
+    from .plugins.git_workflows.git_plugin import sync_work
+
     sync_work(message)
 
 @git_app.command("finish-feature")
@@ -228,6 +284,8 @@ def git_finish_feature():
     """
     Opens a browser to create a pull request for the current branch.
     """
+    from .plugins.git_workflows.git_plugin import finish_feature
+
     finish_feature()
     
 if __name__ == "__main__":
@@ -5,11 +5,13 @@ This module contains the core logic for managing path shortcuts.
 """
 
 import typer
-import yaml
 from pathlib import Path
 from typing import Dict, Any
 
-from tiedye.config_loader import load_config
+from tiedye.config_loader import expand_path, save_paths
+
+_RED = typer.colors.RED
+_GREEN = typer.colors.GREEN
 
 def _get_project_root() -> Path:
     """
@@ -18,48 +20,48 @@ def _get_project_root() -> Path:
     return Path(__file__).parent.parent.parent.parent
 
 def _update_paths(
+        config: Dict[str, Any],
         op: str,
         name: str,
         path_str: str = None
 ):
     """
-    A helper function to add or remove a path from the config.
+    A helper function to add or remove a path from the saved shortcuts.
     """
-    config = load_config()
     paths = config.setdefault('paths', {})
 
     if op == "save":
-        path = Path(path_str).expanduser().resolve()
+        path = expand_path(path_str).resolve()
         if not path.is_dir():
-            typer.secho(f"Error: Path '{path}' is not a valid directory.", fg = typer.colors.RED)
+            typer.secho(f"Error: Path '{path}' is not a valid directory.", fg = _RED)
             return
         paths[name] = str(path)
-        typer.secho(f"✅ Saved shortcut '{name}' -> '{paths[name]}'", fg = typer.colors.GREEN)
+        typer.secho(f"✅ Saved shortcut '{name}' -> '{paths[name]}'", fg = _GREEN)
     
     elif op == "remove" and name in paths:
         del paths[name]
         typer.echo(f"Removed shortcut '{name}'.")
     
-    config_path = _get_project_root() / "tiedye" / "config.yaml"
-    with open(config_path, 'w') as f:
-        yaml.dump(config, f, indent = 2, sort_keys = False)
+    save_paths(paths)
 
 def save_path(
+        config: Dict[str, Any],
         name: str,
         path_str: str
 ):
     """
     Saves a new path shortcut
     """
-    _update_paths("save", name, path_str)
+    _update_paths(config, "save", name, path_str)
 
 def remove_path(
+        config: Dict[str, Any],
         name: str
 ):
     """
     Removes an existing path shortcut.
     """
-    _update_paths("remove", name)
+    _update_paths(config, "remove", name)
 
 def list_paths(
         config: Dict[str, Any]
@@ -98,4 +100,4 @@ def get_path(
         print(path_to_print)
     else:
         # Printing to stderr is important so the shell doesnt capture the error message as a valid path.
-        typer.secho(f"Error: Shortcut '{name}' not found.", fg = typer.colors.RED, err = True)
\ No newline at end of file
+        typer.secho(f"Error: Shortcut '{name}' not found.", fg = _RED, err = True)
\ No newline at end of file
@@ -4,23 +4,76 @@ tiedye/core/scaffolder.py
 This module contains the core logic for the project scaffolding feature.
 """
 
-import shutil
-import yaml
+import os
+import re
 import typer
 
-from pathlib import Path
 from typing import Dict, Any
-from tiedye.config_loader import load_config
+from tiedye.config_loader import expand_path, save_config
 from tiedye.logging import log_event
 
+_RED = typer.colors.RED
+_GREEN = typer.colors.GREEN
+_YELLOW = typer.colors.YELLOW
+
+# New template names are kept to a portable ASCII set. The name becomes a
+# directory under templates_dir, and starting with a letter, digit or '_' rules
+# out '.', '..' and hidden directories.
+_TEMPLATE_NAME_RE = re.compile(r"[A-Za-z0-9_][A-Za-z0-9_.-]{0,63}")
+
+def _is_valid_template_name(
+        template_name: str
+) -> bool:
+    """
+    Checks the name of a new template before anything touches the filesystem.
+    """
+    if _TEMPLATE_NAME_RE.fullmatch(template_name):
+        return True
+
+    typer.secho(
+        f"Error: Invalid template name '{template_name}'. Use up to 64 ASCII letters, digits, "
+        "'.', '_' or '-', not starting with '.' or '-'.",
+        fg = _RED
+    )
+    return False
+
+def _is_safe_template_name(
+        template_name: str
+) -> bool:
+    """
+    Checks that an existing template's name can't point outside templates_dir.
+
+    Templates saved before names were validated may use any characters (e.g.
+    'c++' or 'react (v2)'), so only names that would escape the directory are
+    rejected: path separators, '.', '..' and absolute or drive-qualified names.
+    """
+    separators = (os.sep, os.altsep or os.sep, "/")
+    if (
+        template_name not in ("", ".", "..")
+        and not any(sep in template_name for sep in separators)
+        and not os.path.isabs(template_name)
+        and not os.path.splitdrive(template_name)[0]
+    ):
+        return True
+
+    typer.secho(f"Error: Invalid template name '{template_name}'.", fg = _RED)
+    return False
+
 def save_template(
         config: Dict[str, Any],
         template_name: str,
-        source_path_str: str
+        source_path_str: str,
+        move: bool = False
 ):
     """
     Saves a directory structure as a new template
+
+    If 'move' is True the source directory itself becomes the template instead
+    of being copied, which is a single rename on the same filesystem.
     """
+    if not _is_valid_template_name(template_name):
+        return
+
     scaffolder_config = config.get('scaffolder', {})
     templates_dir_str = scaffolder_config.get('templates_dir')
 
@@ -29,8 +82,8 @@ def save_template(
         return
     
     # --- Path Setup and Validation ---
-    source_path = Path(source_path_str).expanduser()
-    templates_dir = Path(templates_dir_str).expanduser()
+    source_path = expand_path(source_path_str)
+    templates_dir = expand_path(templates_dir_str)
     template_dest_path = templates_dir / template_name
 
     if not source_path.is_dir():
@@ -43,14 +96,20 @@ def save_template(
         return
     
     # --- Template Creation ---
+    # (imported here so 'list' and 'favorite' don't load the copy machinery)
+    from tiedye.fastcopy import copy_tree, move_tree
+
     try:
         # Ensure the main templates directory exists
         templates_dir.mkdir(parents = True, exist_ok = True)
-        # shutil.copytree recursively copies an entire directory tree.
-        shutil.copytree(source_path, template_dest_path)
+        if move:
+            move_tree(source_path, template_dest_path)
+        else:
+            # recursively copies the entire directory tree, cloning files where possible.
+            copy_tree(source_path, template_dest_path)
         typer.secho(
-            f"✅ Successfully saved template '{template_name}'.",
-            fg = typer.colors.GREEN
+            f"✅ Successfully {'moved' if move else 'saved'} template '{template_name}'.",
+            fg = _GREEN
         )
         typer.echo(f"   -> Location: {template_dest_path}")
 
@@ -58,51 +117,64 @@ def save_template(
             "template_saved",
             {
                 "template_name": template_name,
-                "source_path": str(source_path)
+                "source_path": str(source_path),
+                "moved": move
             }
         )
     except Exception as e:
-        typer.secho(f"An error occured while saving the template: {e}", fg = typer.colors.RED)
+        typer.secho(f"An error occured while saving the template: {e}", fg = _RED)
 
 def create_project(
     config: Dict[str, Any],
     template_name: str,
-    project_name: str
+    project_name: str,
+    move: bool = False
 ):
     """
     Creates a new project directory from a saved template
+
+    If 'move' is True the template is consumed: its directory is moved to become
+    the project instead of being copied.
     """
+    if not _is_safe_template_name(template_name):
+        return
+
     scaffolder_config = config.get('scaffolder', {})
     templates_dir_str = scaffolder_config.get('templates_dir')
     dest_dir_str = scaffolder_config.get('default_project_destination', ".")
 
     if not templates_dir_str:
-        typer.secho("Error: 'scaffolder.templates_dir' is not defined in config.yaml.", fg = typer.colors.RED)
+        typer.secho("Error: 'scaffolder.templates_dir' is not defined in config.yaml.", fg = _RED)
         return
     
     # --- Path Setup and Validation ---
-    templates_dir = Path(templates_dir_str).expanduser()
+    templates_dir = expand_path(templates_dir_str)
     template_source_path = templates_dir / template_name
 
-    dest_dir = Path(dest_dir_str).expanduser()
+    dest_dir = expand_path(dest_dir_str)
     project_dest_path = dest_dir / project_name
 
     if not template_source_path.is_dir():
-        typer.secho(f"Error: Template '{template_name}' not found.", fg = typer.colors.RED)
+        typer.secho(f"Error: Template '{template_name}' not found.", fg = _RED)
         return
 
     if project_dest_path.exists():
-        typer.secho(f"Error: Directory '{project_name}' already exists at that location.", fg = typer.colors.RED)
+        typer.secho(f"Error: Directory '{project_name}' already exists at that location.", fg = _RED)
         return
     
     # --- Project Creation ---
+    from tiedye.fastcopy import copy_tree, move_tree
+
     try:
         # ensure the base destination directory exists before copying.
         dest_dir.mkdir(parents = True, exist_ok = True)
-        shutil.copytree(template_source_path, project_dest_path)
+        if move:
+            move_tree(template_source_path, project_dest_path)
+        else:
+            copy_tree(template_source_path, project_dest_path)
         typer.secho(
             f"✅ Successfully created project '{project_name}' from template '{template_name}'.",
-            fg = typer.colors.GREEN
+            fg = _GREEN
         )
         typer.echo(f"   -> Location: {project_dest_path}")
 
@@ -111,11 +183,12 @@ def create_project(
             {
                 "project_name": project_name,
                 "template_name": template_name,
-                "destination_path": str(project_dest_path)
+                "destination_path": str(project_dest_path),
+                "moved": move
             }
         )
     except Exception as e:
-        typer.secho(f"An error occured while creating the project: {e}", fg = typer.colors.RED)
+        typer.secho(f"An error occured while creating the project: {e}", fg = _RED)
 
 def list_templates(
         config: Dict[str, Any]
@@ -128,27 +201,35 @@ def list_templates(
     favorites = scaffolder_config.get('favorites', [])
 
     if not templates_dir_str:
-        typer.secho("Error: 'scaffolder.templates_dir' is not defined in config.yaml.", fg = typer.colors.RED)
+        typer.secho("Error: 'scaffolder.templates_dir' is not defined in config.yaml.", fg = _RED)
         return
     
-    templates_dir = Path(templates_dir_str).expanduser()
+    templates_dir = expand_path(templates_dir_str)
 
     if not templates_dir.is_dir():
         typer.echo("Template directory not found. Save a template first!")
         return
     
-    templates = [item.name for item in templates_dir.iterdir() if item.is_dir()]
+    # DirEntry.is_dir() is answered from the directory listing itself, unlike
+    # Path.is_dir() which needs a stat call per entry.
+    with os.scandir(templates_dir) as it:
+        templates = [entry.name for entry in it if entry.is_dir()]
 
     if not templates:
         typer.echo("No templates discovered in template directory.")
 
-    fav_templates = sorted([t for t in templates if t in favorites])
-    other_templates = sorted([t for t in templates if t not in favorites])
+    # split the templates in a single pass, with O(1) favorite lookups.
+    fav_set = set(favorites)
+    fav_templates, other_templates = [], []
+    for t in templates:
+        (fav_templates if t in fav_set else other_templates).append(t)
+    fav_templates.sort()
+    other_templates.sort()
 
     if fav_templates:
-        typer.secho("⭐ Favorite Templates:", bold = True, fg = typer.colors.YELLOW)
+        typer.secho("⭐ Favorite Templates:", bold = True, fg = _YELLOW)
         for template_name in fav_templates:
-            typer.secho(f"  - {template_name}", fg = typer.colors.YELLOW)
+            typer.secho(f"  - {template_name}", fg = _YELLOW)
 
     if other_templates:
         typer.secho("Avaliable Templates:", bold = True)
@@ -156,39 +237,43 @@ def list_templates(
             typer.echo(f"  - {template_name}")
 
 def _update_favorites(
+        config: Dict[str, Any],
         op: str,
         template_name: str
 ):
     """
     A helper function to add or remove a favorite from the config.
     """
-    config = load_config()
     scaffolder_config = config.setdefault('scaffolder', {})
     favorites = scaffolder_config.setdefault('favorites', [])
 
+    # re-favoriting a favorite (or unfavoriting a non-favorite) changes nothing,
+    # so skip rewriting config.yaml altogether.
     if op == "add" and template_name not in favorites:
         favorites.append(template_name)
     elif op == "remove" and template_name in favorites:
         favorites.remove(template_name)
+    else:
+        return
     
-    config_path = Path(__file__).parent.parent.parent / "config.yaml"
-    with open(config_path, 'w') as f:
-        yaml.dump(config, f, indent = 2, sort_keys = False)
+    save_config(config)
 
 def favorite_template(
+        config: Dict[str, Any],
         template_name: str
 ):
     """
     Adds a template to the favorites list.
     """
-    _update_favorites("add", template_name)
-    typer.secho(f"⭐ Marked '{template_name}' as a favorite.", fg = typer.colors.YELLOW)
+    _update_favorites(config, "add", template_name)
+    typer.secho(f"⭐ Marked '{template_name}' as a favorite.", fg = _YELLOW)
 
 def unfavorite_template(
+        config: Dict[str, Any],
         template_name: str
 ):
     """
     Removes a template from the favorites list.
     """
-    _update_favorites("remove", template_name)
+    _update_favorites(config, "remove", template_name)
     typer.echo(f"Unmarked '{template_name}' as a favorite.")
\ No newline at end of file
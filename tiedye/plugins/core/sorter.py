@@ -5,19 +5,126 @@ This module contains the core logic for the file sorting feature.
 """
 
 import os
-import shutil
+import re
+import errno
+import fnmatch
 import typer
 from pathlib import Path
-from typing import Dict, Any
-from tiedye.logging import log_event
+from typing import Dict, Any, Iterator, Union, Callable, List, Tuple
+from tiedye.config_loader import expand_path
+from tiedye.logging import event_timestamp, log_events_bulk
 
+_RED = typer.colors.RED
+_GREEN = typer.colors.GREEN
+_YELLOW = typer.colors.YELLOW
+_BLUE = typer.colors.BLUE
+
+_GLOB_CHARS = frozenset('*?[')
+
+def _compile_ignore_patterns(
+  patterns: List[str]
+) -> Callable[[str], bool]:
+  """
+  Builds a predicate that tells whether a file or directory name is ignored.
+
+  Plain names are checked with a set lookup. Glob patterns (e.g. '*.tmp') are
+  translated once and joined into a single compiled regex, so each name is
+  matched in one pass no matter how many globs are configured.
+  """
+  literals = frozenset(p for p in patterns if not _GLOB_CHARS.intersection(p))
+  globs = [p for p in patterns if p not in literals]
+
+  if not globs:
+    return literals.__contains__
+
+  ignore_re = re.compile('|'.join(fnmatch.translate(p) for p in globs))
+  return lambda name: name in literals or ignore_re.match(name) is not None
+
+def _walk(
+  directory: Union[str, Path],
+  recursive: bool,
+  is_ignored: Callable[[str], bool],
+  on_error: Callable[[Union[str, Path], OSError], None]
+) -> Iterator[Tuple[str, os.DirEntry]]:
+  """
+  Yields (real_dir, entry) for every file under 'directory' whose name is not
+  ignored, where 'real_dir' is the fully resolved path of the file's directory
+  (computed once per directory, not per file).
+
+  os.scandir hands back the file type straight from the directory listing, so
+  unlike Path.rglob + Path.is_file this needs no extra stat call per entry.
+  Ignored directories are pruned and never descended into.
+
+  Each directory's listing is snapshotted (and its handle closed) before any
+  of its entries are yielded, so the caller can safely move files around while
+  consuming the walk. Only one listing per level of depth is held in memory.
+
+  A directory that can't be read (e.g. no permission) is passed to 'on_error'
+  and skipped, so one bad directory doesn't stop the rest of the walk.
+  """
+  try:
+    with os.scandir(directory) as it:
+      entries = list(it)
+  except OSError as e:
+    on_error(directory, e)
+    return
+
+  real_dir = os.path.realpath(directory)
+
+  for entry in entries:
+    if is_ignored(entry.name):
+      continue
+
+    if entry.is_dir(follow_symlinks = False):
+      if recursive:
+        yield from _walk(entry.path, recursive, is_ignored, on_error)
+    elif entry.is_file(follow_symlinks = False):
+      yield real_dir, entry
+
+def _move(
+  src: Union[str, Path],
+  dst: Union[str, Path]
+):
+  """
+  Moves a single file, replacing 'dst' if it already exists.
+
+  Within one filesystem this is a single rename. Across filesystems (EXDEV)
+  the file is copied with fastcopy.copy_file and the source removed afterwards.
+  """
+  try:
+    os.replace(src, dst)
+    return
+  except OSError as e:
+    if e.errno != errno.EXDEV:
+      raise
+
+  # (only cross-device moves need the copy helpers, so import them on demand)
+  from tiedye.fastcopy import copy_file
+
+  # Copy into a temporary file next to 'dst' and swap it in with one rename, so
+  # an existing destination is only ever replaced by a complete copy. A failed
+  # copy removes just the temporary file and leaves both 'src' and 'dst' alone.
+  dst_dir, dst_name = os.path.split(os.fspath(dst))
+  tmp_path = os.path.join(dst_dir, f".{dst_name}.{os.getpid()}.tmp")
+  try:
+    copy_file(src, tmp_path)
+    os.replace(tmp_path, dst)
+  except BaseException:
+    try:
+      os.unlink(tmp_path)
+    except OSError:
+      pass
+    raise
+
+  os.unlink(src)
 
 # --[ MODIFICATION START]
-# This is the fully refactored function using the two-pass approach
+# This is the fully refactored function using per-directory snapshots (see _walk)
 # to prevent the renaming bug, formatted to your specifications.
 def sort_files(
   config: Dict[str, Any],
-  source_dir_str: str
+  source_dir_str: str,
+  verbose: bool = False
 ):
   """
   Scans a source directory and sorts files into target folders based on
@@ -26,6 +133,7 @@ def sort_files(
   Args:
       config: The loaded configuration dictionary for the application.
       source_dir_str: The string path of the directory to scan.
+      verbose: If True, print a line for every file handled, not just errors and the summary.
   """
   # --- 1. Configuration and Path Setup ---
   sorter_config = config.get('sorter', {}) # (fall back to empty dictionary)
@@ -33,7 +141,7 @@ def sort_files(
     print("Error: 'sorter' configuration is missing from config.yaml.")
     return
   
-  source_dir = Path(source_dir_str).expanduser() # (convert '~' to home dir)
+  source_dir = expand_path(source_dir_str) # (convert '~' to home dir)
 
   if not source_dir.is_dir():
     print(f"Error: Source directory not found at '{source_dir}'")
@@ -46,71 +154,105 @@ def sort_files(
 
   print(f"Scanning '{source_dir}'...")
 
-  # --- 2. Phase 1: Scan and Collect Files ---
-  # First, we gather a list of all files to move. This prevents issues where
-  # we modify the directory tree while we are still iterating over it.
-  files_to_move = []
-  
-  # Path.glob('*') gets everything in the top-level directory.
-  # Path.rglob('*') gets everything in the directory and all subdirectories.
-  file_iterator = source_dir.rglob('*') if recursive else source_dir.glob('*')
+  # --- 2. Build the Rule Lookup ---
+  # Map every extension straight to its rule so each file needs one dict lookup
+  # rather than a scan over every rule's extension list. The first rule that
+  # lists an extension keeps winning, just like the old in-order rule search.
+  # Each target is also resolved once, so "is this file already in its target
+  # folder?" holds for relative and symlinked paths too.
+  ext_map = {}
+  for rule in rules:
+    target_folder = expand_path(rule['target_folder'])
+    target_real = os.path.realpath(target_folder)
+    for ext in rule.get('extensions', []):
+      ext_map.setdefault(ext.lower(), (rule, target_folder, target_real))
 
-  for item_path in file_iterator:
-    if item_path.name in ignore_patterns:
-      continue
-    
-    if item_path.is_file():
-      files_to_move.append(item_path)
-
-  # --- 3. Phase 2: Process and Move Files ---
-  # Now, we iterate over our static list of files to perform the move operations.
-  for item_path in files_to_move:
-    matched_rule = None
-    for rule in rules:
-      if item_path.suffix.lower() in rule.get('extensions', []):
-        matched_rule = rule
-        break # (found a matching rule, no need to check others)
-    
-    if matched_rule:
-      target_folder_str = matched_rule['target_folder']
-      target_folder = Path(target_folder_str).expanduser()
-      target_folder.mkdir(parents=True, exist_ok=True)
+  created_folders = set() # (so each target folder is only created once)
+  sorted_events = [] # (logged in one batch once the run is over)
 
-      destination_path = target_folder / item_path.name
+  # Output is collected and written once at the end instead of one write per file.
+  report = [] # (every per-file line, only shown with --verbose)
+  errors = [] # (always shown)
+  skipped_count = 0
+
+  def _on_walk_error(directory: Union[str, Path], e: OSError):
+    errors.append(typer.style(f"[ERROR]   Could not read directory '{directory}': {e.strerror}", fg = _RED))
+    report.append(errors[-1])
+
+  # --- 3. Scan and Move Files ---
+  # Files are moved as the walk reaches them. _walk snapshots every directory
+  # before yielding from it, so moving files never disturbs the iteration, and
+  # the whole tree never has to be collected in memory first. A target folder
+  # inside the source tree may be walked after files were moved into it; those
+  # files are then already in their target folder and are left alone.
+  try:
+    for real_dir, entry in _walk(source_dir, recursive, _compile_ignore_patterns(ignore_patterns), _on_walk_error):
+      # Slice the extension straight off the name; ext_map keys are already
+      # lowercased, so only this one short string needs lowering per file.
+      name = entry.name
+      dot = name.rfind('.')
+      if dot <= 0:
+        continue # (no extension, and dotfiles like '.env' don't count as one)
+
+      hit = ext_map.get(name[dot:].lower())
+      if hit is None:
+        continue # (no rule handles this extension)
+      matched_rule, target_folder, target_real = hit
 
       # Prevent trying to move a file that is already in its destination folder.
-      if item_path.parent == target_folder:
+      if real_dir == target_real:
         continue
 
+      if target_folder not in created_folders:
+        target_folder.mkdir(parents=True, exist_ok=True)
+        created_folders.add(target_folder)
+
+      item_path = Path(entry.path)
+      destination_path = target_folder / item_path.name
+
       # --- Collision Handling ---
       if destination_path.exists():
         if collision_policy == 'skip':
-          typer.secho(f"[SKIPPED] '{item_path.name}' (destination exists)", fg = typer.colors.YELLOW)
+          report.append(typer.style(f"[SKIPPED] '{item_path.name}' (destination exists)", fg = _YELLOW))
+          skipped_count += 1
           continue
         elif collision_policy == 'overwrite':
-          typer.secho(f"[OVERWRITING] '{destination_path}'", fg = typer.colors.YELLOW)
+          report.append(typer.style(f"[OVERWRITING] '{destination_path}'", fg = _YELLOW))
         elif collision_policy == 'rename':
           count = 1
           while destination_path.exists():
             new_name = f"{item_path.stem} ({count}){item_path.suffix}"
             destination_path = target_folder / new_name
             count += 1
-          typer.secho(f"[RENAMING] to '{destination_path.name}'", fg = typer.colors.BLUE)
+          report.append(typer.style(f"[RENAMING] to '{destination_path.name}'", fg = _BLUE))
 
       # --- The Move Operation ---
       try:
-        shutil.move(item_path, destination_path)
-        typer.secho(f"[MOVED]   '{item_path.name}' -> '{target_folder.name}/'", fg = typer.colors.GREEN)
+        _move(item_path, destination_path)
+        report.append(typer.style(f"[MOVED]   '{item_path.name}' -> '{target_folder.name}/'", fg = _GREEN))
 
-        log_event(
+        sorted_events.append((
+          event_timestamp(), # (taken now, the batch is only written at the end)
           "file_sorted",
           {
             "source": str(item_path),
             "destination": str(destination_path),
             "rule_name": matched_rule.get('name', 'Unnamed Rule')
           }
-        )
+        ))
       except PermissionError:
-        typer.secho(f"[ERROR]   Permission denied to move '{item_path.name}'.", fg = typer.colors.RED)
+        errors.append(typer.style(f"[ERROR]   Permission denied to move '{item_path.name}'.", fg = _RED))
+        report.append(errors[-1])
       except Exception as e:
-        typer.secho(f"[ERROR]   An unexpected error occurred while moving '{item_path.name}:' {e}", fg = typer.colors.RED)
+        errors.append(typer.style(f"[ERROR]   An unexpected error occurred while moving '{item_path.name}:' {e}", fg = _RED))
+        report.append(errors[-1])
+  finally:
+    lines = report if verbose else errors
+    if lines:
+      typer.echo("\n".join(lines))
+    typer.secho(
+      f"Moved {len(sorted_events)} file(s), skipped {skipped_count}, {len(errors)} error(s).",
+      bold = True
+    )
+
+    log_events_bulk(sorted_events)
@@ -2,42 +2,99 @@
 tiedye/plugins/git_workflows/git_plugin.py
 
 This module contains the core logic for Git workflow automation.
+
+Every workflow shells out to the git CLI rather than using bindings such as
+pygit2 or dulwich. Those skip the user's hooks, credential helpers, SSH config
+and pull settings (rebase, ff-only), so commits and pushes could behave
+differently from running the same git commands by hand. Instead, the commands
+of a workflow are chained into a single shell invocation (see _run_chain).
 """
 
+import os
+import shlex
+import functools
 import subprocess
 import typer
-import shutil
 from typing import List
 
-def _run_command(command: List[str]):
+# (bound once, since _run_command prints on every step of a workflow)
+_RED = typer.colors.RED
+_GREEN = typer.colors.GREEN
+_YELLOW = typer.colors.YELLOW
+
+__all__ = ['start_feature', 'sync_work', 'finish_feature']
+
+@functools.lru_cache(maxsize = None)
+def _which(name: str):
+    """
+    Cached shutil.which: each tool's location is only searched for on PATH once per process.
+    """
+    import shutil
+    return shutil.which(name)
+
+def _run_command(command: List[str], display: str = None, capture: bool = False):
     """
     A helper function to run a shell command and handle its output.
 
     This function is the heart of our interaction with external tools.
     It's designed to be safe and provide clear feedback.
+
+    'display' overrides how the command is shown to the user. By default the
+    command writes straight to our stdout/stderr, so progress (e.g. from
+    'git pull') shows up live. Pass capture = True to collect the output
+    instead and echo it once the command has finished.
     """
-    typer.secho(f"🏃 Running: {' '.join(command)}", fg = typer.colors.YELLOW)
+    typer.secho(f"🏃 Running: {display or ' '.join(command)}", fg = _YELLOW)
 
-    # check = true: if the command returns a non-zero exit code, it will raise
-    # a CallProcessError exception which will stop the script.
+    # a missing executable is reported by Popen itself, before any exit code exists.
     try:
         result = subprocess.run(
             command,
-            check = True,
-            capture_output = True,
-            text = True
+            capture_output = capture
         )
-        if result.stdout:
-            typer.echo(result.stdout)
-        return True
     except FileNotFoundError:
-        typer.secho(f"Error: Command '{command[0]}' not found. Is Git installed and in your PATH?", fg = typer.colors.RED)
+        typer.secho(f"Error: Command '{command[0]}' not found. Is Git installed and in your PATH?", fg = _RED)
         return False
-    except subprocess.CalledProcessError as e:
-        typer.secho(f"❌ Command failed with exit code {e.returncode}", fg = typer.colors.RED)
-        typer.secho(e.stderr, fg = typer.colors.RED)
+
+    # a failing git command (conflicts, rejected pushes, ...) is a normal outcome
+    # here, so check the exit code directly rather than raising CalledProcessError.
+    if result.returncode != 0:
+        typer.secho(f"❌ Command failed with exit code {result.returncode}", fg = _RED)
+        if result.stderr:
+            typer.secho(result.stderr, fg = _RED)
         return False
+
+    # (captured output is left as raw bytes, echo writes them through undecoded)
+    if result.stdout:
+        typer.echo(result.stdout)
+    return True
     
+def _run_chain(commands: List[List[str]]):
+    """
+    Runs several commands in sequence, stopping at the first one that fails.
+
+    On POSIX the commands are joined with '&&' and run by a single 'sh -c', so the
+    whole chain costs one process launch from Python instead of one per command.
+    Every argument is quoted with shlex, so nothing is interpreted by the shell.
+    """
+    if os.name == "nt":
+        # cmd.exe can't safely quote arbitrary arguments (e.g. '%' in a commit
+        # message), so on Windows the commands are still run one by one.
+        return all(_run_command(cmd) for cmd in commands)
+
+    # the executable Python starts is 'sh', so a missing git would only show up
+    # as exit code 127. Look the programs up first to keep the helpful message.
+    for program in dict.fromkeys(cmd[0] for cmd in commands):
+        if not _which(program):
+            typer.secho(f"Error: Command '{program}' not found. Is Git installed and in your PATH?", fg = _RED)
+            return False
+
+    chain = " && ".join(shlex.join(cmd) for cmd in commands)
+    if not _run_command(["sh", "-c", chain], display = chain):
+        typer.secho("A step in the chain failed (see its output above), so the remaining commands were not run.", fg = _RED)
+        return False
+    return True
+
 def start_feature(branch_name: str):
     """
     Automates the process of starting a new feature branch from an
@@ -52,14 +109,13 @@ def start_feature(branch_name: str):
         ["git", "push", "-u", "origin", branch_name]
     ]
 
-    # Execute every command in sequence. If any command fails, the loop will
-    # be broken because _run_command will return False.
-    for cmd in commands:
-        if not _run_command(cmd):
-            typer.secho("\n🛑 Aborting feature start due to an error.", fg = typer.colors.RED)
-            return
+    # Execute every command in sequence. If any command fails, the rest are
+    # skipped and _run_chain returns False.
+    if not _run_chain(commands):
+        typer.secho("\n🛑 Aborting feature start due to an error.", fg = _RED)
+        return
     
-    typer.secho(f"\n✅ Successfully created and pushed feature branch '{branch_name}'.", fg = typer.colors.GREEN)
+    typer.secho(f"\n✅ Successfully created and pushed feature branch '{branch_name}'.", fg = _GREEN)
     typer.echo("You are now on the new branch and ready to start coding.")
 
 def sync_work(commit_message: str):
@@ -74,12 +130,11 @@ def sync_work(commit_message: str):
         ["git", "push"]
     ]
     
-    for cmd in commands:
-        if not _run_command(cmd):
-            typer.secho("\n🛑 Aborting sync due to an error.", fg = typer.colors.RED)
-            return
+    if not _run_chain(commands):
+        typer.secho("\n🛑 Aborting sync due to an error.", fg = _RED)
+        return
     
-    typer.secho("\n✅ Successfully synced your changes.", fg = typer.colors.GREEN)
+    typer.secho("\n✅ Successfully synced your changes.", fg = _GREEN)
 
 def finish_feature():
     """
@@ -88,15 +143,15 @@ def finish_feature():
     """
     typer.secho("🏁 Finishing feature and creating pull request...", bold = True)
 
-    if not shutil.which('gh'):
-        typer.secho("Error: GitHub CLI ('gh') not found.", fg = typer.colors.RED)
+    if not _which('gh'):
+        typer.secho("Error: GitHub CLI ('gh') not found.", fg = _RED)
         typer.echo("Please install it to use this feature. See: https://cli.github.com/")
         return
     
     command = ["gh", "pr", "create", "--fill", "--web"]
 
-    if not _run_command(command):
-        typer.secho("\n🛑 Could not create pull request.", fg = typer.colors.RED)
+    if not _run_command(command, capture = True):
+        typer.secho("\n🛑 Could not create pull request.", fg = _RED)
         return
     
-    typer.secho("\n✅ Your browser has been opened to create the pull request.", fg = typer.colors.GREEN)
\ No newline at end of file
+    typer.secho("\n✅ Your browser has been opened to create the pull request.", fg = _GREEN)
\ No newline at end of file